@@ -18,6 +18,7 @@ class Config:
     MAX_TEXT_LENGTH: int = int(os.environ.get('MAX_TEXT_LENGTH', '8000'))
     BATCH_SIZE: int = int(os.environ.get('BATCH_SIZE', '10'))
     ENABLE_CACHING: bool = os.environ.get('ENABLE_CACHING', 'false').lower() == 'true'
+    EMBEDDING_CACHE_SIZE: int = int(os.environ.get('EMBEDDING_CACHE_SIZE', '1024'))
     
     # Cost Optimization
     ENABLE_COST_TRACKING: bool = os.environ.get('ENABLE_COST_TRACKING', 'true').lower() == 'true'
@@ -33,6 +34,7 @@ class Config:
         try:
             assert cls.MAX_TEXT_LENGTH > 0, "MAX_TEXT_LENGTH must be positive"
             assert cls.BATCH_SIZE > 0, "BATCH_SIZE must be positive"
+            assert cls.EMBEDDING_CACHE_SIZE > 0, "EMBEDDING_CACHE_SIZE must be positive"
             assert cls.BEDROCK_TIMEOUT > 0, "BEDROCK_TIMEOUT must be positive"
             assert cls.BEDROCK_MAX_RETRIES >= 0, "BEDROCK_MAX_RETRIES must be non-negative"
             return True
@@ -49,6 +51,7 @@ class Config:
             'max_text_length': cls.MAX_TEXT_LENGTH,
             'batch_size': cls.BATCH_SIZE,
             'enable_caching': cls.ENABLE_CACHING,
+            'embedding_cache_size': cls.EMBEDDING_CACHE_SIZE,
             'enable_cost_tracking': cls.ENABLE_COST_TRACKING,
             'log_level': cls.LOG_LEVEL
         }
\ No newline at end of file
@@ -1,11 +1,16 @@
 # src/embedding_lambda/logger.py
 
-import json
 import logging
 import time
+
+import orjson
 from typing import Any, Dict, Optional
 from config import Config
 
+# Captured once so hot-path checks read a module-level local instead of a
+# class attribute
+_DETAILED_LOGGING = Config.ENABLE_DETAILED_LOGGING
+
 class StructuredLogger:
     """Structured logging for Lambda function with cost tracking."""
     
@@ -19,21 +24,41 @@ class StructuredLogger:
             formatter = logging.Formatter('%(message)s')
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
-    
+
+        # Pre-bound emitters; levels are fixed strings, so skip the
+        # str.lower + getattr dispatch on every log call
+        self._emit = {
+            'INFO': self.logger.info,
+            'WARNING': self.logger.warning,
+            'ERROR': self.logger.error,
+            'DEBUG': self.logger.debug
+        }
+
     def _log_structured(self, level: str, message: str, **kwargs):
         """Log structured JSON message."""
+        # Skip dict construction and serialization entirely when the level
+        # would be discarded anyway
+        if not self.logger.isEnabledFor(logging._nameToLevel[level]):
+            return
+
         log_entry = {
             'timestamp': time.time(),
             'level': level,
             'message': message,
-            'lambda_request_id': kwargs.pop('lambda_request_id', None),
-            **kwargs
         }
-        
-        # Remove None values
-        log_entry = {k: v for k, v in log_entry.items() if v is not None}
-        
-        getattr(self.logger, level.lower())(json.dumps(log_entry))
+        request_id = kwargs.pop('lambda_request_id', None)
+        if request_id is not None:
+            log_entry['lambda_request_id'] = request_id
+        log_entry.update(kwargs)
+
+        # Drop any remaining None values in place instead of rebuilding
+        # the whole dict per log call
+        for key in [k for k, v in log_entry.items() if v is None]:
+            del log_entry[key]
+
+        self._emit[level](
+            orjson.dumps(log_entry, option=orjson.OPT_NON_STR_KEYS).decode()
+        )
     
     def info(self, message: str, **kwargs):
         """Log info message."""
@@ -49,12 +74,28 @@ class StructuredLogger:
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        if Config.ENABLE_DETAILED_LOGGING:
+        if _DETAILED_LOGGING and self.logger.isEnabledFor(logging.DEBUG):
             self._log_structured('DEBUG', message, **kwargs)
 
+class NoopCostTracker:
+    """Drop-in stand-in for CostTracker when cost tracking is disabled.
+
+    Selecting this once at startup means hot-path callers skip the
+    per-call ENABLE_COST_TRACKING checks entirely.
+    """
+
+    def track_embedding_request(self, text_length: int, success: bool = True):
+        pass
+
+    def check_cost_limits(self) -> bool:
+        return True
+
+    def log_final_metrics(self, lambda_request_id: str):
+        pass
+
 class CostTracker:
     """Track and log cost-related metrics."""
-    
+
     def __init__(self, logger: StructuredLogger):
         self.logger = logger
         self.metrics = {
@@ -67,9 +108,6 @@ class CostTracker:
     
     def track_embedding_request(self, text_length: int, success: bool = True):
         """Track embedding generation request."""
-        if not Config.ENABLE_COST_TRACKING:
-            return
-            
         self.metrics['total_tokens_processed'] += text_length
         self.metrics['total_api_calls'] += 1
         
@@ -80,9 +118,6 @@ class CostTracker:
     
     def check_cost_limits(self) -> bool:
         """Check if cost limits are exceeded."""
-        if not Config.ENABLE_COST_TRACKING:
-            return True
-            
         if self.metrics['total_tokens_processed'] > Config.MAX_TOKENS_PER_EXECUTION:
             self.logger.warning(
                 "Token limit exceeded",
@@ -94,9 +129,6 @@ class CostTracker:
     
     def log_final_metrics(self, lambda_request_id: str):
         """Log final execution metrics."""
-        if not Config.ENABLE_COST_TRACKING:
-            return
-            
         execution_time = time.time() - self.metrics['execution_start_time']
         
         # Estimate costs (approximate pricing)
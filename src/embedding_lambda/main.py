@@ -1,63 +1,163 @@
 # src/embedding_lambda/main.py
 
-import json
 import boto3
 import hashlib
+import threading
 import time
-from typing import List, Dict, Optional, Any
+
+import numpy as np
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any
 from botocore.config import Config as BotoConfig
-from botocore.exceptions import ClientError, BotoCoreError
+from botocore.exceptions import (
+    ClientError,
+    BotoCoreError,
+    ConnectionClosedError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
 
 from config import Config
-from logger import StructuredLogger, CostTracker
+from logger import StructuredLogger, CostTracker, NoopCostTracker
 
 # Validate configuration on startup
 Config.validate()
 
-# Initialize logger and cost tracker
+# Initialize logger and cost tracker; specialize once at startup so
+# disabled cost tracking costs nothing per call
 logger = StructuredLogger(__name__)
-cost_tracker = CostTracker(logger)
+cost_tracker = CostTracker(logger) if Config.ENABLE_COST_TRACKING else NoopCostTracker()
 
-# Initialize the Bedrock Runtime client with retry configuration
-bedrock_runtime = boto3.client(
-    service_name='bedrock-runtime',
-    region_name=Config.AWS_REGION,
-    config=BotoConfig(
-        retries={'max_attempts': Config.BEDROCK_MAX_RETRIES},
-        read_timeout=Config.BEDROCK_TIMEOUT
+# Explicit session so init can warm the credential chain the clients
+# built from it will use
+_session = boto3.Session()
+
+def _create_bedrock_client():
+    """Creates the Bedrock Runtime client with retry configuration."""
+    return _session.client(
+        service_name='bedrock-runtime',
+        region_name=Config.AWS_REGION,
+        config=BotoConfig(
+            retries={'max_attempts': Config.BEDROCK_MAX_RETRIES},
+            read_timeout=Config.BEDROCK_TIMEOUT,
+            max_pool_connections=Config.BATCH_SIZE,
+            tcp_keepalive=True
+        )
     )
-)
+
+# Initialize the Bedrock Runtime client with retry configuration
+bedrock_runtime = _create_bedrock_client()
+
+# Resolve the credential chain during init; boto3 defers it (including
+# any IMDS/STS round-trips) until the first signed request, which would
+# otherwise land inside the first handler invocation
+try:
+    _session.get_credentials()
+except Exception:
+    pass
+
+class EmbeddingCache:
+    """Bounded LRU cache for embeddings, held across warm invocations.
+
+    An unbounded dict would grow without limit on a busy warm Lambda,
+    so evict least-recently-used entries once the configured size is
+    reached. Entries are the raw float32 bytes of each vector (~6KB for
+    1536 dims) rather than lists of Python floats (~40KB+).
+
+    get/put are guarded by a lock: the handler probes the cache from the
+    batch worker threads, and an unguarded get could move_to_end a key a
+    concurrent put just evicted.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key, embedding: bytes):
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
 
 # Simple in-memory cache for embeddings (if enabled)
-embedding_cache = {} if Config.ENABLE_CACHING else None
+embedding_cache = EmbeddingCache(Config.EMBEDDING_CACHE_SIZE) if Config.ENABLE_CACHING else None
+
+def _is_stale_connection_error(error: Exception) -> bool:
+    """True when the error indicates a pooled TLS connection went stale.
+
+    On container reuse after a long idle AWS may reset pooled
+    connections; these failures are transient and worth one retry on a
+    fresh client rather than failing the record outright.
+    """
+    return isinstance(error, (ConnectionClosedError, EndpointConnectionError, ReadTimeoutError))
+
+def generate_embedding(text: str, request_id: str = None, _retry: bool = False) -> Optional[np.ndarray]:
+    """Generates an embedding for the given text using the Titan model.
 
-def generate_embedding(text: str, request_id: str = None) -> Optional[List[float]]:
-    """Generates an embedding for the given text using the Titan model."""
-    # Truncate text if too long
-    if len(text) > Config.MAX_TEXT_LENGTH:
+    Returns a float32 numpy array; callers expand it to a list only at
+    the serialization boundary.
+    """
+    global bedrock_runtime
+
+    # Truncate text if too long; capture the length once so the original
+    # size is logged correctly and len() isn't recomputed below
+    original_length = len(text)
+    if original_length > Config.MAX_TEXT_LENGTH:
         text = text[:Config.MAX_TEXT_LENGTH]
+        text_length = Config.MAX_TEXT_LENGTH
         logger.info(
-            "Text truncated for embedding", 
-            original_length=len(text), 
-            truncated_length=Config.MAX_TEXT_LENGTH,
+            "Text truncated for embedding",
+            original_length=original_length,
+            truncated_length=text_length,
             lambda_request_id=request_id
         )
-    
+    else:
+        text_length = original_length
+
     # Check cache if enabled
     cache_key = None
-    if Config.ENABLE_CACHING and embedding_cache is not None:
-        cache_key = hashlib.md5(text.encode()).hexdigest()
-        if cache_key in embedding_cache:
-            logger.debug("Cache hit for embedding", cache_key=cache_key, lambda_request_id=request_id)
-            cost_tracker.track_embedding_request(len(text), success=True)
-            return embedding_cache[cache_key]
+    if embedding_cache is not None:
+        # blake2b is noticeably faster than md5 and cache keys don't need
+        # cryptographic strength; 8 bytes is plenty for a 1024-entry cache
+        cache_key = hashlib.blake2b(text.encode(), digest_size=8).digest()
+        cached = embedding_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for embedding", cache_key=cache_key.hex(), lambda_request_id=request_id)
+            cost_tracker.track_embedding_request(text_length, success=True)
+            return np.frombuffer(cached, dtype=np.float32)
     
     # Check cost limits
     if not cost_tracker.check_cost_limits():
         logger.error("Cost limits exceeded, skipping embedding generation", lambda_request_id=request_id)
         return None
     
-    body = json.dumps({"inputText": text})
+    # orjson emits bytes, which invoke_model accepts directly
+    body = orjson.dumps({"inputText": text})
     
     start_time = time.time()
     try:
@@ -67,20 +167,23 @@ def generate_embedding(text: str, request_id: str = None) -> Optional[List[float
             accept='application/json',
             contentType='application/json'
         )
-        response_body = json.loads(response.get('body').read())
-        embedding = response_body.get('embedding')
-        
+        response_body = orjson.loads(response.get('body').read())
+        raw_embedding = response_body.get('embedding')
+        # float32 is plenty of precision for k-NN and a quarter of the
+        # memory of a list of Python floats
+        embedding = np.asarray(raw_embedding, dtype=np.float32) if raw_embedding is not None else None
+
         # Track successful request
-        cost_tracker.track_embedding_request(len(text), success=True)
-        
+        cost_tracker.track_embedding_request(text_length, success=True)
+
         # Cache if enabled
-        if Config.ENABLE_CACHING and embedding_cache is not None and cache_key:
-            embedding_cache[cache_key] = embedding
+        if embedding_cache is not None and cache_key and embedding is not None:
+            embedding_cache.put(cache_key, embedding.tobytes())
         
         execution_time = time.time() - start_time
         logger.info(
             "Embedding generated successfully",
-            text_length=len(text),
+            text_length=text_length,
             execution_time=round(execution_time, 3),
             model_id=Config.BEDROCK_MODEL_ID,
             lambda_request_id=request_id
@@ -91,38 +194,67 @@ def generate_embedding(text: str, request_id: str = None) -> Optional[List[float
     except ClientError as e:
         error_code = e.response['Error']['Code']
         error_message = e.response['Error']['Message']
-        cost_tracker.track_embedding_request(len(text), success=False)
+        cost_tracker.track_embedding_request(text_length, success=False)
         
         logger.error(
             "Bedrock API error",
             error_code=error_code,
             error_message=error_message,
-            text_length=len(text),
+            text_length=text_length,
             lambda_request_id=request_id
         )
         return None
         
     except BotoCoreError as e:
-        cost_tracker.track_embedding_request(len(text), success=False)
+        if _is_stale_connection_error(e) and not _retry:
+            # Rebuild the module-level client and retry once on a fresh
+            # connection pool
+            logger.warning(
+                "Stale Bedrock connection, rebuilding client and retrying",
+                error=str(e),
+                lambda_request_id=request_id
+            )
+            bedrock_runtime = _create_bedrock_client()
+            return generate_embedding(text, request_id, _retry=True)
+
+        cost_tracker.track_embedding_request(text_length, success=False)
         logger.error(
             "Boto3 error during embedding generation",
             error=str(e),
-            text_length=len(text),
+            text_length=text_length,
             lambda_request_id=request_id
         )
         return None
         
     except Exception as e:
-        cost_tracker.track_embedding_request(len(text), success=False)
+        cost_tracker.track_embedding_request(text_length, success=False)
         logger.error(
             "Unexpected error during embedding generation",
             error=str(e),
             error_type=type(e).__name__,
-            text_length=len(text),
+            text_length=text_length,
             lambda_request_id=request_id
         )
         return None
 
+def build_full_message(record: Dict[str, Any]) -> str:
+    """Builds the text sent to the embedding model from a log record.
+
+    Joins only the non-empty parts; a 'service' list is flattened to its
+    items so the embedding isn't polluted with list-repr brackets/quotes.
+    """
+    services = record.get('service', '')
+    if isinstance(services, list):
+        services = " ".join(services)
+    return " ".join(
+        part for part in (
+            services,
+            record.get('user_id', ''),
+            record.get('level', ''),
+            record.get('message', '')
+        ) if part
+    )
+
 def lambda_handler(data: Dict[str, Any], context) -> Dict[str, Any]:
     """
     Receives a batch of log records from OpenSearch Ingestion, 
@@ -130,73 +262,86 @@ def lambda_handler(data: Dict[str, Any], context) -> Dict[str, Any]:
     """
     request_id = context.aws_request_id if context else 'unknown'
     
-    records = data.get('events', [])    
+    records = data.get('events', [])
+    total_records = len(records)
     logger.info(
         "Lambda execution started",
         lambda_request_id=request_id,
-        record_count=len(records),
+        record_count=total_records,
         config=Config.get_debug_info() if Config.ENABLE_DETAILED_LOGGING else None
     )
     
-    processed_records = []
     successful_embeddings = 0
     failed_embeddings = 0
-    
+
     # Process records in batches for better performance
-    batch_size = min(Config.BATCH_SIZE, len(records)) if records else 1
+    batch_size = min(Config.BATCH_SIZE, total_records) if records else 1
     batch_size = max(1, batch_size)  # Ensure batch_size is at least 1
-    
-    for i in range(0, len(records), batch_size):
-        batch = records[i:i + batch_size]        
-        for record_index, record in enumerate(batch):
-            try:                
-                log_message = record.get('message', '')
-                log_services = record.get('service', [])
-                log_user_id = record.get('user_id', '')
-                log_level = record.get('level', '')
-                full_message = f"{log_services} {log_user_id} {log_level} {log_message}".strip()
-
-                embedding = generate_embedding(full_message, request_id)
-                if embedding:
-                    # Add the new embedding vector to the log data
-                    record['log_embedding'] = embedding
-                    record['embedding_model'] = Config.BEDROCK_MODEL_ID
-                    record['embedding_timestamp'] = int(time.time())
-                    successful_embeddings += 1
-                else:
+
+    # Hoist loop invariants; one timestamp per invocation is enough.
+    # Binding the hot-loop callables to locals also skips a global/class
+    # lookup per record.
+    model_id = Config.BEDROCK_MODEL_ID
+    embedding_timestamp = int(time.time())
+    _log_debug = logger.debug
+
+    def _embed_record(record: Dict[str, Any]) -> Optional[np.ndarray]:
+        # Build the message inside the task so a malformed record raises
+        # into its own future and is handled per record below, instead of
+        # aborting the whole invocation
+        return generate_embedding(build_full_message(record), request_id)
+
+    # Embedding calls are network-bound, so run each batch through a thread
+    # pool instead of waiting on serial Bedrock round-trips.
+    with ThreadPoolExecutor(max_workers=batch_size) as executor:
+        _submit = executor.submit
+        for i in range(0, total_records, batch_size):
+            batch = records[i:i + batch_size]
+            futures = [_submit(_embed_record, record) for record in batch]
+            for record_index, (record, future) in enumerate(zip(batch, futures)):
+                try:
+                    embedding = future.result()
+                    if embedding is not None:
+                        # Add the new embedding vector to the log data,
+                        # expanded to a plain list for JSON serialization
+                        record['log_embedding'] = embedding.tolist()
+                        record['embedding_model'] = model_id
+                        record['embedding_timestamp'] = embedding_timestamp
+                        successful_embeddings += 1
+                    else:
+                        failed_embeddings += 1
+                        _log_debug(
+                            "Failed to generate embedding for record",
+                            record_index=i + record_index,
+                            message_length=len(record.get('message', '')),
+                            lambda_request_id=request_id
+                        )
+
+                except Exception as e:
                     failed_embeddings += 1
-                    logger.debug(
-                        "Failed to generate embedding for record",
+                    logger.error(
+                        "Error processing record",
                         record_index=i + record_index,
-                        message_length=len(log_message),
+                        error=str(e),
+                        error_type=type(e).__name__,
                         lambda_request_id=request_id
                     )
-                
-                # Keep the original record structure and append the modified data
-                processed_records.append(record)
-                
-            except Exception as e:
-                failed_embeddings += 1
-                logger.error(
-                    "Error processing record",
-                    record_index=i + record_index,
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    lambda_request_id=request_id
-                )
-                # Include the original record even if processing failed
-                processed_records.append(record)
     
     # Log final metrics
     cost_tracker.log_final_metrics(request_id)
     
+    # Integer math keeps two decimal places without an FP divide + round
+    success_rate = (successful_embeddings * 10000 // total_records) / 100 if total_records else 0
+
     logger.info(
         "Lambda execution completed",
         lambda_request_id=request_id,
-        total_records=len(records),
+        total_records=total_records,
         successful_embeddings=successful_embeddings,
         failed_embeddings=failed_embeddings,
-        success_rate=round((successful_embeddings / len(records)) * 100, 2) if records else 0
+        success_rate=success_rate,
+        cache_stats=embedding_cache.stats() if embedding_cache is not None else None
     )
     
-    return {"events": processed_records}
+    # Records were enriched in place, so they double as the output list
+    return {"events": records}
@@ -1,19 +1,25 @@
 #!/usr/bin/env python3
 
 import boto3
+from functools import lru_cache
 from opensearchpy import OpenSearch, RequestsHttpConnection
 from requests_aws4auth import AWS4Auth
 import json
 
-def search_opensearch_logs(endpoint, query="*", size=10):
+@lru_cache(maxsize=8)
+def get_opensearch_client(endpoint):
     """
-    Simple function to search logs in OpenSearch
+    Build an OpenSearch client for the endpoint once and reuse it.
+
+    Credentials, AWS4Auth, and the TLS connection pool are expensive to
+    set up, so cache the client per endpoint instead of rebuilding it on
+    every search.
     """
     # Get AWS credentials
     session = boto3.Session()
     credentials = session.get_credentials()
     region = session.region_name or 'us-east-1'
-    
+
     # Setup authentication
     awsauth = AWS4Auth(
         credentials.access_key,
@@ -22,28 +28,37 @@ def search_opensearch_logs(endpoint, query="*", size=10):
         'aoss',
         session_token=credentials.token
     )
-    
+
     # Create OpenSearch client
     host = endpoint.replace('https://', '').replace('http://', '')
-    client = OpenSearch(
+    return OpenSearch(
         hosts=[{'host': host, 'port': 443}],
         http_auth=awsauth,
         use_ssl=True,
         verify_certs=True,
-        connection_class=RequestsHttpConnection
+        connection_class=RequestsHttpConnection,
+        pool_maxsize=20
     )
-    
-    # Search logs
+
+def search_opensearch_logs(endpoint, query="*", size=10):
+    """
+    Simple function to search logs in OpenSearch
+    """
+    client = get_opensearch_client(endpoint)
+
+    # A plain match query skips Lucene's full query-string parser;
+    # "*" / empty keeps the old match-everything behavior
+    if query and query != "*":
+        os_query = {"match": {"message": query}}
+    else:
+        os_query = {"match_all": {}}
+
     search_body = {
-        "query": {
-            "query_string": {
-                "query": query
-            }
-        },
+        "query": os_query,
         "size": size,
         "sort": [{"timestamp": {"order": "desc"}}]
     }
-    
+
     try:
         response = client.search(index="os-vector-index-aiops-dev-logs", body=search_body)
         return response['hits']['hits']
@@ -55,7 +70,7 @@ def search_opensearch_logs(endpoint, query="*", size=10):
 if __name__ == "__main__":
     endpoint = "https://<collection_id>.<region>.aoss.amazonaws.aom"
     results = search_opensearch_logs(endpoint, query="ERROR", size=5)
-    
+
     for hit in results:
         print(json.dumps(hit['_source'], indent=2))
         print("-" * 50)
@@ -1,10 +1,14 @@
 import csv
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests_aws4auth import AWS4Auth
+from urllib3.util.retry import Retry
 import boto3
-import time
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from threading import Semaphore
+from typing import Dict, Iterable, Iterator, List
 import sys
 
 # Configuration
@@ -12,11 +16,33 @@ CSV_FILE = "sample_logs.csv"
 PIPELINE_URL = "https://aiops-dev-pipeline-<pipeline_id>.<region>.osis.amazonaws.com/aiops-dev-pipeline/logs"
 AWS_REGION = "us-east-1"
 BATCH_SIZE = 5
-DELAY_BETWEEN_BATCHES = 2
+MAX_CONCURRENT_BATCHES = 4
+
+# CSV columns that should be coerced to int; frozenset gives O(1)
+# membership checks in the per-cell loop
+NUMERIC_FIELDS = frozenset({'duration_ms', 'status_code'})
 
 current_directory = sys.path[0]
 csv_file_path = f"{current_directory}/{CSV_FILE}"
 
+# One session keeps the TLS connection alive across batches instead of
+# re-handshaking per request; the adapter sizes the pool for the worker
+# threads and retries transient throttling/5xx responses with backoff
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # urllib3's default allowed_methods excludes POST, which is the
+        # only method this script uses; sending a batch twice is fine
+        # since OSIS ingestion is idempotent per record
+        allowed_methods=frozenset({'POST'})
+    )
+))
+
 
 def get_aws_auth() -> AWS4Auth:
     """Get AWS authentication for OSIS requests."""
@@ -33,30 +59,26 @@ def get_aws_auth() -> AWS4Auth:
         print(f"Error getting AWS credentials: {e}")
         sys.exit(1)
 
-def read_logs_from_csv(filename: str) -> List[Dict]:
-    """Read log entries from CSV file."""
-    logs = []
+def read_logs_from_csv(filename: str) -> Iterator[Dict]:
+    """Stream log entries from CSV file one row at a time."""
     try:
         with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
+                # csv.DictReader already yields a fresh dict per row, so
+                # coerce fields in place instead of rebuilding a new dict
+                for key in NUMERIC_FIELDS:
+                    value = row.get(key)
+                    if value:
+                        stripped = value.strip()
+                        # str.isdigit is a C-level check, cheaper than
+                        # try/except int() on non-numeric values
+                        row[key] = int(stripped) if stripped.isdigit() else value
                 # Convert empty strings to None for optional fields
-                log_entry = {}
                 for key, value in row.items():
-                    if value.strip():  # If not empty
-                        # Convert numeric fields
-                        if key in ['duration_ms', 'status_code']:
-                            try:
-                                log_entry[key] = int(value)
-                            except ValueError:
-                                log_entry[key] = value
-                        else:
-                            log_entry[key] = value
-                    else:
-                        log_entry[key] = None
-                logs.append(log_entry)
-        print(f"Successfully read {len(logs)} log entries from {filename}")
-        return logs
+                    if isinstance(value, str) and not value.strip():
+                        row[key] = None
+                yield row
     except FileNotFoundError:
         print(f"Error: CSV file {filename} not found")
         sys.exit(1)
@@ -68,12 +90,12 @@ def send_batch_to_pipeline(logs_batch: List[Dict], auth: AWS4Auth, url: str) ->
     """Send a batch of logs to the OSIS pipeline."""
     try:
         # Send as JSON array
-        payload = json.dumps(logs_batch)
-        
+        payload = orjson.dumps(logs_batch)
+
         print(f"Sending batch of {len(logs_batch)} logs...")
-        print(f"Payload preview: {payload[:200]}...")
-        
-        response = requests.post(
+        print(f"Payload preview: {payload[:200].decode('utf-8', 'replace')}...")
+
+        response = session.post(
             url,
             data=payload,
             auth=auth,
@@ -83,7 +105,7 @@ def send_batch_to_pipeline(logs_batch: List[Dict], auth: AWS4Auth, url: str) ->
             },
             timeout=30
         )
-        
+
         if response.status_code == 200:
             print(f"Batch sent successfully (Status: {response.status_code})")
             return True
@@ -91,7 +113,7 @@ def send_batch_to_pipeline(logs_batch: List[Dict], auth: AWS4Auth, url: str) ->
             print(f"Failed to send batch (Status: {response.status_code})")
             print(f"Response: {response.text}")
             return False
-            
+
     except requests.exceptions.Timeout:
         print("Request timed out")
         return False
@@ -102,29 +124,41 @@ def send_batch_to_pipeline(logs_batch: List[Dict], auth: AWS4Auth, url: str) ->
         print(f"Unexpected error: {e}")
         return False
 
-def create_batches(logs: List[Dict], batch_size: int) -> List[List[Dict]]:
-    """Split logs into batches of specified size."""
-    batches = []
-    for i in range(0, len(logs), batch_size):
-        batch = logs[i:i + batch_size]
-        batches.append(batch)
-    return batches
+def create_batches(logs: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Group a stream of logs into batches of specified size."""
+    iterator = iter(logs)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
 
 def main():
     auth = get_aws_auth()
     logs = read_logs_from_csv(csv_file_path)
-    # Create batches
-    batches = create_batches(logs, BATCH_SIZE)
     successful_batches = 0
     failed_batches = 0
-    for i, batch in enumerate(batches, 1):
-        if send_batch_to_pipeline(batch, auth, PIPELINE_URL):
-            successful_batches += 1
-        else:
-            failed_batches += 1
-        if i < len(batches):
-            time.sleep(DELAY_BETWEEN_BATCHES)
-    
+    total_logs = 0
+
+    # Bound the number of in-flight batches so the CSV is consumed at the
+    # pace the pipeline accepts it, instead of sleeping between requests
+    inflight = Semaphore(MAX_CONCURRENT_BATCHES * 2)
+    futures = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BATCHES) as executor:
+        for batch in create_batches(logs, BATCH_SIZE):
+            total_logs += len(batch)
+            inflight.acquire()
+            future = executor.submit(send_batch_to_pipeline, batch, auth, PIPELINE_URL)
+            future.add_done_callback(lambda _: inflight.release())
+            futures.append(future)
+
+        for future in futures:
+            if future.result():
+                successful_batches += 1
+            else:
+                failed_batches += 1
+
+    print(f"Processed {total_logs} log entries in {len(futures)} batches")
     if failed_batches == 0:
         print("All logs sent successfully!")
     else:
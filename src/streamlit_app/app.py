@@ -2,7 +2,7 @@
 
 import streamlit as st
 import boto3
-import json
+import orjson
 import time
 import hashlib
 from typing import List, Dict, Any, Optional
@@ -11,11 +11,11 @@ from requests_aws4auth import AWS4Auth
 from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
-from config import AppConfig
-from logger import StreamlitLogger, CostTracker, QueryCache
+from config import CFG, get_debug_info, validate
+from logger import get_logger, render_debug_log, CostTracker, QueryCache
 
 # Initialize configuration and validate
-config_errors = AppConfig.validate()
+config_errors = validate()
 if config_errors:
     st.error("Configuration errors detected:")
     for key, error in config_errors.items():
@@ -23,15 +23,15 @@ if config_errors:
     st.stop()
 
 # Initialize logger, cost tracker, and cache
-logger = StreamlitLogger(__name__)
+logger = get_logger(__name__)
 cost_tracker = CostTracker(logger)
 query_cache = QueryCache(logger)
 
 # Initialize session ID for tracking
 if 'session_id' not in st.session_state:
-    st.session_state.session_id = hashlib.md5(str(time.time()).encode()).hexdigest()[:8]
+    st.session_state.session_id = hashlib.blake2b(str(time.time()).encode(), digest_size=4).hexdigest()
 
-logger.info("Streamlit app started", config=AppConfig.get_debug_info())
+logger.info("Streamlit app started", config=get_debug_info())
 
 # --- Boto3 and OpenSearch Clients ---
 try:
@@ -45,22 +45,22 @@ try:
     awsauth = AWS4Auth(
         credentials.access_key, 
         credentials.secret_key, 
-        AppConfig.AWS_REGION, 
+        CFG.AWS_REGION, 
         'aoss', 
         session_token=credentials.token
     )
     
     bedrock_runtime = session.client(
         'bedrock-runtime', 
-        region_name=AppConfig.AWS_REGION,
+        region_name=CFG.AWS_REGION,
         config=BotoConfig(
-            retries={'max_attempts': AppConfig.BEDROCK_MAX_RETRIES},
-            read_timeout=AppConfig.BEDROCK_TIMEOUT
+            retries={'max_attempts': CFG.BEDROCK_MAX_RETRIES},
+            read_timeout=CFG.BEDROCK_TIMEOUT
         )
     )
     
     os_client = OpenSearch(
-        hosts=[{'host': AppConfig.OPENSEARCH_HOST, 'port': 443}],
+        hosts=[{'host': CFG.OPENSEARCH_HOST, 'port': 443}],
         http_auth=awsauth,
         use_ssl=True,
         verify_certs=True,
@@ -76,105 +76,111 @@ except Exception as e:
     st.stop()
 
 # --- Functions ---
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
 def get_embedding(text: str) -> Optional[List[float]]:
-    """Generates an embedding for the given text using the Titan model."""
+    """Generates an embedding for the given text using the Titan model.
+
+    Bedrock errors propagate to the caller: st.cache_data does not cache
+    exceptions, so a transient failure is retried on the next request
+    instead of pinning None for the TTL.
+    """
     if not text or not text.strip():
         logger.warning("Empty text provided for embedding")
         return None
-    
+
     # Track the request
     cost_tracker.track_embedding_request(len(text))
-    
-    body = json.dumps({"inputText": text})
-    
+
+    # orjson emits bytes, which invoke_model accepts directly
+    body = orjson.dumps({"inputText": text})
+
     start_time = time.time()
-    try:
-        response = bedrock_runtime.invoke_model(
-            body=body,
-            modelId=AppConfig.BEDROCK_MODEL_ID_EMBEDDING,
-            accept='application/json',
-            contentType='application/json'
-        )
-        response_body = json.loads(response.get('body').read())
-        embedding = response_body.get('embedding')
-        
-        execution_time = time.time() - start_time
-        logger.info(
-            "Embedding generated",
-            text_length=len(text),
-            execution_time=round(execution_time, 3),
-            model_id=AppConfig.BEDROCK_MODEL_ID_EMBEDDING
-        )
-        
-        return embedding
-        
-    except ClientError as e:
-        error_code = e.response['Error']['Code']
-        error_message = e.response['Error']['Message']
-        logger.error("Bedrock API error", error_code=error_code, error_message=error_message)
-        st.error(f"❌ Bedrock API error: {error_message}")
-        return None
-        
-    except Exception as e:
-        logger.error("Unexpected error during embedding generation", error=str(e))
-        st.error(f"❌ Error generating embedding: {e}")
-        return None
+    response = bedrock_runtime.invoke_model(
+        body=body,
+        modelId=CFG.BEDROCK_MODEL_ID_EMBEDDING,
+        accept='application/json',
+        contentType='application/json'
+    )
+    response_body = orjson.loads(response.get('body').read())
+    embedding = response_body.get('embedding')
+
+    execution_time = time.time() - start_time
+    logger.info(
+        "Embedding generated",
+        text_length=len(text),
+        execution_time=round(execution_time, 3),
+        model_id=CFG.BEDROCK_MODEL_ID_EMBEDDING
+    )
+
+    return embedding
 
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
 def search_logs(query_vector, k=10):
-    """Performs a k-NN search on the OpenSearch index."""
+    """Performs a k-NN search on the OpenSearch index.
+
+    Pass the vector as a tuple so the cache key is hashable and stable.
+    OpenSearch errors propagate so a failed search is not cached as an
+    empty result for the TTL.
+    """
     if query_vector is None:
         return []
-    
+
     query = {
         "size": k,
         "query": {
             "knn": {
                 "log_embedding": {
-                    "vector": query_vector,
+                    "vector": list(query_vector),
                     "k": k
                 }
             }
         }
     }
-    try:
-        response = os_client.search(index=AppConfig.INDEX_NAME, body=query)
-        return [hit['_source']['message'] for hit in response['hits']['hits']]
-    except Exception as e:
-        st.error(f"Error searching logs: {e}")
-        return []
+    response = os_client.search(index=CFG.INDEX_NAME, body=query)
+    return [hit['_source']['message'] for hit in response['hits']['hits']]
+
+# Static prompt template, built once at import; only the logs and the
+# question are substituted per call
+_PROMPT_TEMPLATE = """You are an expert AIOps assistant. Your task is to answer questions about application behavior based *only* on the provided log entries. Do not use any prior knowledge. If the answer cannot be found in the logs, you must state 'I cannot answer the question based on the provided logs.'
+
+Here are the relevant log entries retrieved:
+<logs>
+{logs}
+</logs>
+
+Based on the logs above, please answer the following question:
+<question>
+{question}
+</question>
+"""
 
 def get_llm_response(question, logs):
-    """Sends the retrieved logs and question to Claude for a synthesized answer."""
-    log_context = "\n".join(logs)
-    
-    prompt = f"""
-    You are an expert AIOps assistant. Your task is to answer questions about application behavior based *only* on the provided log entries. Do not use any prior knowledge. If the answer cannot be found in the logs, you must state 'I cannot answer the question based on the provided logs.'
-
-    Here are the relevant log entries retrieved:
-    <logs>
-    {log_context}
-    </logs>
-
-    Based on the logs above, please answer the following question:
-    <question>
-    {question}
-    </question>
+    """Streams a synthesized answer for the question from Claude.
+
+    Yields text chunks as Bedrock produces them so the UI renders
+    progressively instead of blocking on the full generation.
     """
-    
-    return prompt
-    body = json.dumps({
+    log_context = "\n".join(logs) if isinstance(logs, list) else logs
+    prompt = _PROMPT_TEMPLATE.format(logs=log_context, question=question)
+
+    body = orjson.dumps({
         "anthropic_version": "bedrock-2023-05-31",
         "max_tokens": 4096,
         "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
     })
-    
+
     try:
-        response = bedrock_runtime.invoke_model(body=body, modelId=BEDROCK_MODEL_ID_CLAUDE)
-        response_body = json.loads(response.get('body').read())
-        return response_body['content'][0]['text']
+        response = bedrock_runtime.invoke_model_with_response_stream(
+            body=body,
+            modelId=CFG.BEDROCK_MODEL_ID_CLAUDE
+        )
+        for event in response.get('body'):
+            chunk = orjson.loads(event['chunk']['bytes'])
+            if chunk.get('type') == 'content_block_delta':
+                yield chunk['delta'].get('text', '')
     except Exception as e:
         st.error(f"Error getting LLM response: {e}")
-        return "An error occurred while generating the answer."
+        yield "An error occurred while generating the answer."
 
 # --- Streamlit UI ---
 st.set_page_config(page_title="Chat with Your Logs", layout="wide")
@@ -189,22 +195,43 @@ if st.button("Get Answer", key="get_answer"):
         with st.spinner("Analyzing logs..."):
             # 1. Embed the user's question
             st.write("Step 1: Generating embedding for your question...")
-            query_embedding = get_embedding(user_question)
-            
+            try:
+                query_embedding = get_embedding(user_question)
+            except ClientError as e:
+                error_message = e.response['Error']['Message']
+                logger.error(
+                    "Bedrock API error",
+                    error_code=e.response['Error']['Code'],
+                    error_message=error_message
+                )
+                st.error(f"❌ Bedrock API error: {error_message}")
+                query_embedding = None
+            except Exception as e:
+                logger.error("Unexpected error during embedding generation", error=str(e))
+                st.error(f"❌ Error generating embedding: {e}")
+                query_embedding = None
+
             # 2. Perform k-NN search to find relevant logs
             st.write("Step 2: Searching for relevant logs in OpenSearch...")
-            relevant_logs = search_logs(query_embedding)
+            try:
+                relevant_logs = search_logs(tuple(query_embedding)) if query_embedding else []
+            except Exception as e:
+                logger.error("Error searching logs", error=str(e))
+                st.error(f"Error searching logs: {e}")
+                relevant_logs = []
             
             if not relevant_logs:
                 st.warning("No relevant logs found for your question.")
             else:
                 st.write(f"Step 3: Found {len(relevant_logs)} relevant logs. Synthesizing an answer with Claude...")
-                # 3. Get a synthesized answer from the LLM
-                answer = get_llm_response(user_question, relevant_logs)
+                # 3. Stream a synthesized answer from the LLM
                 st.success("Answer:")
-                st.markdown(answer)
+                st.write_stream(get_llm_response(user_question, relevant_logs))
 
                 with st.expander("See retrieved logs used as context"):
                     st.json(relevant_logs)
     else:
         st.warning("Please enter a question.")
+
+# Render buffered debug log entries once per rerun (debug mode only)
+render_debug_log()
@@ -1,85 +1,130 @@
 # src/streamlit_app/config.py
 
+import functools
 import os
-import streamlit as st
+from dataclasses import dataclass
 from typing import Dict, Any
 
+@dataclass(frozen=True, slots=True)
 class AppConfig:
-    """Configuration management for the Streamlit application."""
-    
+    """Configuration for the Streamlit application.
+
+    Frozen with slots so hot-path reads (cost tracking, caching,
+    logging flags) are C-level slot lookups instead of class-dict
+    attribute resolution.
+    """
+
     # AWS Configuration
-    AWS_REGION: str = os.environ.get('AWS_REGION', st.secrets.get('AWS_REGION', 'us-east-1'))
-    
+    AWS_REGION: str
+
     # OpenSearch Configuration
-    OPENSEARCH_HOST: str = os.environ.get(
-        'OPENSEARCH_HOST', 
-        st.secrets.get('OPENSEARCH_HOST', 'YOUR_OPENSEARCH_SERVERLESS_ENDPOINT')
-    )
-    INDEX_NAME: str = os.environ.get('INDEX_NAME', st.secrets.get('INDEX_NAME', 'application-logs-*'))
-    
+    OPENSEARCH_HOST: str
+    INDEX_NAME: str
+
     # Bedrock Configuration
-    BEDROCK_MODEL_ID_EMBEDDING: str = os.environ.get(
-        'BEDROCK_MODEL_ID_EMBEDDING',
-        st.secrets.get('BEDROCK_MODEL_ID_EMBEDDING', 'amazon.titan-embed-text-v1')
-    )
-    BEDROCK_MODEL_ID_CLAUDE: str = os.environ.get(
-        'BEDROCK_MODEL_ID_CLAUDE',
-        st.secrets.get('BEDROCK_MODEL_ID_CLAUDE', 'anthropic.claude-3-sonnet-20240229-v1:0')
-    )
-    BEDROCK_TIMEOUT: int = int(os.environ.get('BEDROCK_TIMEOUT', st.secrets.get('BEDROCK_TIMEOUT', '30')))
-    BEDROCK_MAX_RETRIES: int = int(os.environ.get('BEDROCK_MAX_RETRIES', st.secrets.get('BEDROCK_MAX_RETRIES', '3')))
-    
+    BEDROCK_MODEL_ID_EMBEDDING: str
+    BEDROCK_MODEL_ID_CLAUDE: str
+    BEDROCK_TIMEOUT: int
+    BEDROCK_MAX_RETRIES: int
+
     # Search Configuration
-    DEFAULT_SEARCH_SIZE: int = int(os.environ.get('DEFAULT_SEARCH_SIZE', st.secrets.get('DEFAULT_SEARCH_SIZE', '10')))
-    MAX_SEARCH_SIZE: int = int(os.environ.get('MAX_SEARCH_SIZE', st.secrets.get('MAX_SEARCH_SIZE', '50')))
-    
+    DEFAULT_SEARCH_SIZE: int
+    MAX_SEARCH_SIZE: int
+
     # UI Configuration
-    PAGE_TITLE: str = os.environ.get('PAGE_TITLE', st.secrets.get('PAGE_TITLE', 'Chat with Your Logs'))
-    MAX_QUERY_LENGTH: int = int(os.environ.get('MAX_QUERY_LENGTH', st.secrets.get('MAX_QUERY_LENGTH', '500')))
-    
+    PAGE_TITLE: str
+    MAX_QUERY_LENGTH: int
+
     # Cost Optimization
-    ENABLE_COST_TRACKING: bool = os.environ.get('ENABLE_COST_TRACKING', st.secrets.get('ENABLE_COST_TRACKING', 'true')).lower() == 'true'
-    MAX_TOKENS_PER_SESSION: int = int(os.environ.get('MAX_TOKENS_PER_SESSION', st.secrets.get('MAX_TOKENS_PER_SESSION', '500000')))
-    ENABLE_QUERY_CACHING: bool = os.environ.get('ENABLE_QUERY_CACHING', st.secrets.get('ENABLE_QUERY_CACHING', 'true')).lower() == 'true'
-    
+    ENABLE_COST_TRACKING: bool
+    MAX_TOKENS_PER_SESSION: int
+    ENABLE_QUERY_CACHING: bool
+
     # Rate Limiting
-    MAX_REQUESTS_PER_HOUR: int = int(os.environ.get('MAX_REQUESTS_PER_HOUR', st.secrets.get('MAX_REQUESTS_PER_HOUR', '100')))
-    
+    MAX_REQUESTS_PER_HOUR: int
+
     # Logging Configuration
-    LOG_LEVEL: str = os.environ.get('LOG_LEVEL', st.secrets.get('LOG_LEVEL', 'INFO'))
-    ENABLE_DEBUG_MODE: bool = os.environ.get('ENABLE_DEBUG_MODE', st.secrets.get('ENABLE_DEBUG_MODE', 'false')).lower() == 'true'
-    
-    @classmethod
-    def validate(cls) -> Dict[str, str]:
-        """Validate configuration and return any errors."""
-        errors = {}
-        
-        if cls.OPENSEARCH_HOST == 'YOUR_OPENSEARCH_SERVERLESS_ENDPOINT':
-            errors['opensearch_host'] = 'Please configure OpenSearch host endpoint'
-        
-        if cls.MAX_SEARCH_SIZE < cls.DEFAULT_SEARCH_SIZE:
-            errors['search_size'] = 'MAX_SEARCH_SIZE must be >= DEFAULT_SEARCH_SIZE'
-        
-        if cls.MAX_QUERY_LENGTH <= 0:
-            errors['query_length'] = 'MAX_QUERY_LENGTH must be positive'
-        
-        if cls.MAX_TOKENS_PER_SESSION <= 0:
-            errors['token_limit'] = 'MAX_TOKENS_PER_SESSION must be positive'
-        
-        return errors
-    
-    @classmethod
-    def get_debug_info(cls) -> Dict[str, Any]:
-        """Get configuration info for debugging (without sensitive data)."""
-        return {
-            'aws_region': cls.AWS_REGION,
-            'opensearch_configured': cls.OPENSEARCH_HOST != 'YOUR_OPENSEARCH_SERVERLESS_ENDPOINT',
-            'index_name': cls.INDEX_NAME,
-            'bedrock_embedding_model': cls.BEDROCK_MODEL_ID_EMBEDDING,
-            'bedrock_claude_model': cls.BEDROCK_MODEL_ID_CLAUDE,
-            'default_search_size': cls.DEFAULT_SEARCH_SIZE,
-            'max_search_size': cls.MAX_SEARCH_SIZE,
-            'cost_tracking_enabled': cls.ENABLE_COST_TRACKING,
-            'caching_enabled': cls.ENABLE_QUERY_CACHING,
-            'debug_mode': cls.ENABLE_DEBUG_MODE
-        }
\ No newline at end of file
+    LOG_LEVEL: str
+    LOG_FORMAT: str
+    ENABLE_DEBUG_MODE: bool
+
+@functools.lru_cache(maxsize=1)
+def _secrets() -> Dict[str, Any]:
+    """Snapshot st.secrets lazily, once.
+
+    Importing streamlit pulls in its whole dependency graph (tornado,
+    protobuf, pyarrow) and st.secrets parses secrets.toml, so only pay
+    that when an env var is missing -- CLI tools and tests that set all
+    values via the environment never import streamlit at all.
+    """
+    try:
+        import streamlit
+        return dict(streamlit.secrets)
+    except Exception:
+        return {}
+
+def _cfg(key: str, default: str) -> str:
+    """Resolve a setting from the environment, then secrets, then default."""
+    value = os.environ.get(key)
+    if value is not None:
+        return value
+    return _secrets().get(key, default)
+
+# Resolved once at import; the rest of the app reads this singleton
+CFG = AppConfig(
+    AWS_REGION=_cfg('AWS_REGION', 'us-east-1'),
+    OPENSEARCH_HOST=_cfg('OPENSEARCH_HOST', 'YOUR_OPENSEARCH_SERVERLESS_ENDPOINT'),
+    INDEX_NAME=_cfg('INDEX_NAME', 'application-logs-*'),
+    BEDROCK_MODEL_ID_EMBEDDING=_cfg('BEDROCK_MODEL_ID_EMBEDDING', 'amazon.titan-embed-text-v1'),
+    BEDROCK_MODEL_ID_CLAUDE=_cfg('BEDROCK_MODEL_ID_CLAUDE', 'anthropic.claude-3-sonnet-20240229-v1:0'),
+    BEDROCK_TIMEOUT=int(_cfg('BEDROCK_TIMEOUT', '30')),
+    BEDROCK_MAX_RETRIES=int(_cfg('BEDROCK_MAX_RETRIES', '3')),
+    DEFAULT_SEARCH_SIZE=int(_cfg('DEFAULT_SEARCH_SIZE', '10')),
+    MAX_SEARCH_SIZE=int(_cfg('MAX_SEARCH_SIZE', '50')),
+    PAGE_TITLE=_cfg('PAGE_TITLE', 'Chat with Your Logs'),
+    MAX_QUERY_LENGTH=int(_cfg('MAX_QUERY_LENGTH', '500')),
+    ENABLE_COST_TRACKING=_cfg('ENABLE_COST_TRACKING', 'true').lower() == 'true',
+    MAX_TOKENS_PER_SESSION=int(_cfg('MAX_TOKENS_PER_SESSION', '500000')),
+    ENABLE_QUERY_CACHING=_cfg('ENABLE_QUERY_CACHING', 'true').lower() == 'true',
+    MAX_REQUESTS_PER_HOUR=int(_cfg('MAX_REQUESTS_PER_HOUR', '100')),
+    LOG_LEVEL=_cfg('LOG_LEVEL', 'INFO'),
+    LOG_FORMAT=_cfg('LOG_FORMAT', 'json').lower(),
+    ENABLE_DEBUG_MODE=_cfg('ENABLE_DEBUG_MODE', 'false').lower() == 'true',
+)
+
+def validate(config: AppConfig = CFG) -> Dict[str, str]:
+    """Validate configuration and return any errors."""
+    errors = {}
+
+    if config.OPENSEARCH_HOST == 'YOUR_OPENSEARCH_SERVERLESS_ENDPOINT':
+        errors['opensearch_host'] = 'Please configure OpenSearch host endpoint'
+
+    if config.MAX_SEARCH_SIZE < config.DEFAULT_SEARCH_SIZE:
+        errors['search_size'] = 'MAX_SEARCH_SIZE must be >= DEFAULT_SEARCH_SIZE'
+
+    if config.MAX_QUERY_LENGTH <= 0:
+        errors['query_length'] = 'MAX_QUERY_LENGTH must be positive'
+
+    if config.MAX_TOKENS_PER_SESSION <= 0:
+        errors['token_limit'] = 'MAX_TOKENS_PER_SESSION must be positive'
+
+    if config.LOG_FORMAT not in ('json', 'logfmt'):
+        errors['log_format'] = "LOG_FORMAT must be 'json' or 'logfmt'"
+
+    return errors
+
+def get_debug_info(config: AppConfig = CFG) -> Dict[str, Any]:
+    """Get configuration info for debugging (without sensitive data)."""
+    return {
+        'aws_region': config.AWS_REGION,
+        'opensearch_configured': config.OPENSEARCH_HOST != 'YOUR_OPENSEARCH_SERVERLESS_ENDPOINT',
+        'index_name': config.INDEX_NAME,
+        'bedrock_embedding_model': config.BEDROCK_MODEL_ID_EMBEDDING,
+        'bedrock_claude_model': config.BEDROCK_MODEL_ID_CLAUDE,
+        'default_search_size': config.DEFAULT_SEARCH_SIZE,
+        'max_search_size': config.MAX_SEARCH_SIZE,
+        'cost_tracking_enabled': config.ENABLE_COST_TRACKING,
+        'caching_enabled': config.ENABLE_QUERY_CACHING,
+        'log_format': config.LOG_FORMAT,
+        'debug_mode': config.ENABLE_DEBUG_MODE
+    }
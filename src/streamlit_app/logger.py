@@ -1,52 +1,138 @@
 # src/streamlit_app/logger.py
 
-import json
+import functools
+import hashlib
 import logging
 import time
+
+import orjson
 import streamlit as st
+from collections import OrderedDict, deque
 from typing import Any, Dict, Optional
-from datetime import datetime, timedelta
-from config import AppConfig
+from datetime import datetime
+from config import CFG
+
+def _serialize_json(log_entry: Dict[str, Any]) -> str:
+    """Serialize a log entry as a JSON line."""
+    return orjson.dumps(log_entry, option=orjson.OPT_UTC_Z).decode()
+
+def _serialize_logfmt(log_entry: Dict[str, Any]) -> str:
+    """Serialize a log entry as logfmt key=value pairs.
+
+    Cheaper than JSON for the typical flat entry: no structural
+    characters and strings are only quoted when they contain
+    spaces/=/quotes.
+    """
+    parts = []
+    for key, value in log_entry.items():
+        if isinstance(value, str):
+            if ' ' in value or '=' in value or '"' in value:
+                value = '"' + value.replace('"', '\\"') + '"'
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        parts.append(f"{key}={value}")
+    return " ".join(parts)
+
+def _debug_buffer() -> deque:
+    """Return the session's debug log buffer, creating it if needed."""
+    buf = st.session_state.get('_debug_log_buffer')
+    if buf is None:
+        buf = deque(maxlen=100)
+        st.session_state['_debug_log_buffer'] = buf
+    return buf
+
+def render_debug_log():
+    """Render the buffered debug log entries once in the sidebar.
+
+    Call this once at the end of the main script; rendering per log line
+    would push one websocket message to the browser per entry.
+    """
+    if not CFG.ENABLE_DEBUG_MODE:
+        return
+    buf = st.session_state.get('_debug_log_buffer')
+    if buf:
+        with st.sidebar.expander("🪵 Debug log"):
+            if CFG.LOG_FORMAT == 'json':
+                # Entries are pre-serialized JSON strings; join into one array
+                st.json(f"[{','.join(buf)}]")
+            else:
+                st.code("\n".join(buf))
 
 class StreamlitLogger:
     """Structured logging for Streamlit application."""
-    
+
+    __slots__ = ('logger', '_log_fns', '_serialize')
+
     def __init__(self, name: str = __name__):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, AppConfig.LOG_LEVEL.upper()))
+        self.logger.setLevel(getattr(logging, CFG.LOG_LEVEL.upper()))
         
-        # Configure handler if not already configured
+        # Configure handler if not already configured; the JSON payload
+        # already embeds timestamp and level, so a bare %(message)s
+        # formatter avoids duplicate asctime formatting per record
         if not self.logger.handlers:
             handler = logging.StreamHandler()
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            formatter = logging.Formatter('%(message)s')
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
-    
+        # Keep root handlers from re-formatting the same record
+        self.logger.propagate = False
+
+        # Pre-bound emitters; levels are fixed strings, so skip the
+        # str.lower + getattr dispatch on every log call
+        self._log_fns = {
+            'INFO': self.logger.info,
+            'WARNING': self.logger.warning,
+            'ERROR': self.logger.error,
+            'DEBUG': self.logger.debug
+        }
+
+        # Serializer chosen once from LOG_FORMAT, not per log call
+        self._serialize = _serialize_json if CFG.LOG_FORMAT == 'json' else _serialize_logfmt
+
     def _log_structured(self, level: str, message: str, **kwargs):
         """Log structured message."""
+        # Skip dict construction, session lookup, and serialization when
+        # the level would be discarded anyway
+        if not self.logger.isEnabledFor(logging._nameToLevel[level]):
+            return
+
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            # orjson serializes datetimes natively in C, so skip the
+            # Python-level isoformat() call
+            'timestamp': datetime.utcnow(),
             'level': level,
             'message': message,
             'session_id': self._get_session_id(),
             **kwargs
         }
-        
-        # Remove None values
-        log_entry = {k: v for k, v in log_entry.items() if v is not None}
-        
-        if AppConfig.ENABLE_DEBUG_MODE:
-            # Also log to Streamlit sidebar in debug mode
-            with st.sidebar:
-                st.json(log_entry)
-        
-        getattr(self.logger, level.lower())(json.dumps(log_entry))
+
+        # No caller passes None-valued kwargs and the fixed fields are
+        # always set, so skip the defensive dict rebuild that used to
+        # filter Nones here
+        payload = self._serialize(log_entry)
+
+        if CFG.ENABLE_DEBUG_MODE:
+            # Buffer for the sidebar instead of calling st.json per line;
+            # the app renders the buffer once per rerun (render_debug_log)
+            _debug_buffer().append(payload)
+
+        self._log_fns[level](payload)
     
     def _get_session_id(self) -> str:
-        """Get Streamlit session ID."""
+        """Get Streamlit session ID.
+
+        Read per call: the logger itself is a process-wide singleton (see
+        get_logger), so caching the id on the instance would pin the
+        first session's id for every other session. session_state raises
+        when accessed outside a script run (e.g. bare-python imports);
+        only those failures are expected, so the except is kept narrow
+        rather than a bare try/except that would also swallow programming
+        errors.
+        """
         try:
             return st.session_state.get('session_id', 'unknown')
-        except:
+        except (AttributeError, RuntimeError):
             return 'unknown'
     
     def info(self, message: str, **kwargs):
@@ -63,16 +149,35 @@ class StreamlitLogger:
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        if AppConfig.ENABLE_DEBUG_MODE:
+        if self.logger.isEnabledFor(logging.DEBUG) and CFG.ENABLE_DEBUG_MODE:
             self._log_structured('DEBUG', message, **kwargs)
 
+@functools.lru_cache(maxsize=None)
+def get_logger(name: str = __name__) -> StreamlitLogger:
+    """Return a shared StreamlitLogger per name.
+
+    Streamlit re-runs modules on every interaction; caching here keeps
+    handler setup and method binding a one-time cost.
+    """
+    return StreamlitLogger(name)
+
 class CostTracker:
     """Track and display cost-related metrics for the Streamlit app."""
     
     def __init__(self, logger: StreamlitLogger):
         self.logger = logger
         self._init_session_state()
-    
+        # Session state stores the dict by reference, so mutations through
+        # this cached handle persist without a proxy lookup per call
+        self._metrics = st.session_state.cost_metrics
+
+    def _bind(self) -> Dict[str, Any]:
+        """Return the cached metrics dict, rebinding if state was cleared."""
+        if 'cost_metrics' not in st.session_state:
+            self._init_session_state()
+            self._metrics = st.session_state.cost_metrics
+        return self._metrics
+
     def _init_session_state(self):
         """Initialize session state for cost tracking."""
         if 'cost_metrics' not in st.session_state:
@@ -83,28 +188,30 @@ class CostTracker:
                 'total_embeddings_generated': 0,
                 'total_llm_requests': 0,
                 'estimated_cost': 0.0,
-                'hourly_requests': []
+                # Per-hour request counters keyed by the truncated hour;
+                # O(1) updates instead of an ever-growing timestamp list
+                'hourly_counts': {}
             }
     
     def track_query(self, query_length: int):
         """Track a user query."""
-        if not AppConfig.ENABLE_COST_TRACKING:
+        if not CFG.ENABLE_COST_TRACKING:
             return
         
-        metrics = st.session_state.cost_metrics
+        metrics = self._bind()
         metrics['total_queries'] += 1
-        
-        # Add to hourly tracking
-        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
-        metrics['hourly_requests'].append(current_hour)
-        
-        # Clean old entries (keep only last 24 hours)
-        cutoff_time = current_hour - timedelta(hours=24)
-        metrics['hourly_requests'] = [
-            req_time for req_time in metrics['hourly_requests'] 
-            if req_time >= cutoff_time
-        ]
-        
+
+        # Add to hourly tracking; integer epoch hours avoid the datetime
+        # allocations and calendar arithmetic of now().replace(...)
+        current_hour = int(time.time()) // 3600
+        counts = metrics['hourly_counts']
+        counts[current_hour] = counts.get(current_hour, 0) + 1
+
+        # Clean old buckets (keep only last 24 hours)
+        cutoff_hour = current_hour - 24
+        for hour in [h for h in counts if h < cutoff_hour]:
+            del counts[hour]
+
         self.logger.info(
             "Query tracked",
             query_length=query_length,
@@ -113,10 +220,10 @@ class CostTracker:
     
     def track_embedding_request(self, text_length: int):
         """Track embedding generation request."""
-        if not AppConfig.ENABLE_COST_TRACKING:
+        if not CFG.ENABLE_COST_TRACKING:
             return
         
-        metrics = st.session_state.cost_metrics
+        metrics = self._bind()
         metrics['total_tokens_processed'] += text_length
         metrics['total_embeddings_generated'] += 1
         
@@ -126,10 +233,10 @@ class CostTracker:
     
     def track_llm_request(self, input_tokens: int, output_tokens: int):
         """Track LLM (Claude) request."""
-        if not AppConfig.ENABLE_COST_TRACKING:
+        if not CFG.ENABLE_COST_TRACKING:
             return
         
-        metrics = st.session_state.cost_metrics
+        metrics = self._bind()
         metrics['total_llm_requests'] += 1
         
         # Approximate Claude pricing: $3 per 1M input tokens, $15 per 1M output tokens
@@ -146,32 +253,30 @@ class CostTracker:
     
     def check_rate_limits(self) -> bool:
         """Check if rate limits are exceeded."""
-        if not AppConfig.ENABLE_COST_TRACKING:
+        if not CFG.ENABLE_COST_TRACKING:
             return True
         
-        metrics = st.session_state.cost_metrics
+        metrics = self._bind()
         
-        # Check hourly rate limit
-        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
-        recent_requests = [
-            req_time for req_time in metrics['hourly_requests']
-            if req_time >= current_hour - timedelta(hours=1)
-        ]
-        
-        if len(recent_requests) >= AppConfig.MAX_REQUESTS_PER_HOUR:
+        # Check hourly rate limit; the window aligns to the current hour,
+        # so this is one bucket lookup
+        current_hour = int(time.time()) // 3600
+        recent_requests = metrics['hourly_counts'].get(current_hour, 0)
+
+        if recent_requests >= CFG.MAX_REQUESTS_PER_HOUR:
             self.logger.warning(
                 "Hourly rate limit exceeded",
-                requests_last_hour=len(recent_requests),
-                limit=AppConfig.MAX_REQUESTS_PER_HOUR
+                requests_last_hour=recent_requests,
+                limit=CFG.MAX_REQUESTS_PER_HOUR
             )
             return False
         
         # Check session token limit
-        if metrics['total_tokens_processed'] > AppConfig.MAX_TOKENS_PER_SESSION:
+        if metrics['total_tokens_processed'] > CFG.MAX_TOKENS_PER_SESSION:
             self.logger.warning(
                 "Session token limit exceeded",
                 tokens_processed=metrics['total_tokens_processed'],
-                limit=AppConfig.MAX_TOKENS_PER_SESSION
+                limit=CFG.MAX_TOKENS_PER_SESSION
             )
             return False
         
@@ -179,10 +284,10 @@ class CostTracker:
     
     def display_metrics(self):
         """Display cost metrics in Streamlit sidebar."""
-        if not AppConfig.ENABLE_COST_TRACKING:
+        if not CFG.ENABLE_COST_TRACKING:
             return
         
-        metrics = st.session_state.cost_metrics
+        metrics = self._bind()
         session_duration = time.time() - metrics['session_start_time']
         
         with st.sidebar:
@@ -197,26 +302,27 @@ class CostTracker:
                 st.metric("LLM Calls", metrics['total_llm_requests'])
                 st.metric("Est. Cost", f"${metrics['estimated_cost']:.4f}")
             
-            # Rate limiting info
-            current_hour_requests = len([
-                req for req in metrics['hourly_requests']
-                if req >= datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
-            ])
-            
+            # Rate limiting info; precompute the ratios as locals and
+            # clamp so st.progress never sees an out-of-range value
+            current_hour_requests = metrics['hourly_counts'].get(int(time.time()) // 3600, 0)
+            tokens_processed = metrics['total_tokens_processed']
+            rate_ratio = min(1.0, current_hour_requests / CFG.MAX_REQUESTS_PER_HOUR)
+            token_ratio = min(1.0, tokens_processed / CFG.MAX_TOKENS_PER_SESSION)
+
             st.progress(
-                current_hour_requests / AppConfig.MAX_REQUESTS_PER_HOUR,
-                text=f"Rate Limit: {current_hour_requests}/{AppConfig.MAX_REQUESTS_PER_HOUR} requests/hour"
+                rate_ratio,
+                text=f"Rate Limit: {current_hour_requests}/{CFG.MAX_REQUESTS_PER_HOUR} requests/hour"
             )
-            
+
             st.progress(
-                metrics['total_tokens_processed'] / AppConfig.MAX_TOKENS_PER_SESSION,
-                text=f"Tokens: {metrics['total_tokens_processed']:,}/{AppConfig.MAX_TOKENS_PER_SESSION:,}"
+                token_ratio,
+                text=f"Tokens: {tokens_processed:,}/{CFG.MAX_TOKENS_PER_SESSION:,}"
             )
             
-            if AppConfig.ENABLE_DEBUG_MODE:
+            if CFG.ENABLE_DEBUG_MODE:
                 st.json({
                     'session_duration_minutes': round(session_duration / 60, 2),
-                    'avg_query_length': round(metrics['total_tokens_processed'] / max(metrics['total_queries'], 1), 2)
+                    'avg_query_length': round(tokens_processed / max(metrics['total_queries'], 1), 2)
                 })
 
 
@@ -230,48 +336,56 @@ class QueryCache:
     def _init_session_state(self):
         """Initialize session state for caching."""
         if 'query_cache' not in st.session_state:
-            st.session_state.query_cache = {}
+            # OrderedDict gives O(1) LRU eviction via move_to_end/popitem
+            st.session_state.query_cache = OrderedDict()
     
     def get_cache_key(self, query: str, search_size: int) -> str:
-        """Generate cache key for query."""
-        return f"{hash(query)}_{search_size}"
+        """Generate cache key for query.
+
+        blake2b keys are stable across processes (builtin hash() is
+        randomized per run), so the cache could later be externalized
+        without key churn.
+        """
+        return hashlib.blake2b(f"{search_size}|{query}".encode(), digest_size=8).hexdigest()
     
     def get(self, query: str, search_size: int) -> Optional[Dict[str, Any]]:
         """Get cached result if available."""
-        if not AppConfig.ENABLE_QUERY_CACHING:
+        if not CFG.ENABLE_QUERY_CACHING:
             return None
         
         cache_key = self.get_cache_key(query, search_size)
-        cached_result = st.session_state.query_cache.get(cache_key)
-        
-        if cached_result:
-            # Check if cache is still valid (5 minutes)
-            if time.time() - cached_result['timestamp'] < 300:
+        cache = st.session_state.query_cache
+        entry = cache.get(cache_key)
+
+        if entry is not None:
+            # Entries are (expiry, data) tuples; integer-second expiry is
+            # precise enough for a 5-minute TTL and cheaper than per-hit
+            # float subtraction against a stored timestamp
+            expiry, data = entry
+            if expiry > time.time():
+                cache.move_to_end(cache_key)
                 self.logger.info("Cache hit", cache_key=cache_key, query=query[:50])
-                return cached_result['data']
-            else:
-                # Remove expired cache entry
-                del st.session_state.query_cache[cache_key]
-        
+                return data
+            # Remove expired cache entry
+            cache.pop(cache_key)
+
         return None
     
     def set(self, query: str, search_size: int, result: Dict[str, Any]):
         """Cache query result."""
-        if not AppConfig.ENABLE_QUERY_CACHING:
+        if not CFG.ENABLE_QUERY_CACHING:
             return
         
         cache_key = self.get_cache_key(query, search_size)
-        st.session_state.query_cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': result
-        }
-        
-        # Limit cache size (keep only 50 most recent)
-        if len(st.session_state.query_cache) > 50:
-            oldest_key = min(
-                st.session_state.query_cache.keys(),
-                key=lambda k: st.session_state.query_cache[k]['timestamp']
-            )
-            del st.session_state.query_cache[oldest_key]
-        
+        cache = st.session_state.query_cache
+        # (expiry, data) tuple instead of a per-entry dict: no hash table
+        # per entry and the TTL is computed once at store time
+        cache[cache_key] = (int(time.time()) + 300, result)
+        cache.move_to_end(cache_key)
+
+        # Limit cache size (keep only 50 most recent); eviction is O(1)
+        # from the insertion-ordered front
+        while len(cache) > 50:
+            cache.popitem(last=False)
+
         self.logger.info("Result cached", cache_key=cache_key, query=query[:50])
\ No newline at end of file